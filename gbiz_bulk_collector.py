@@ -22,8 +22,31 @@ import os
 import sys
 import csv
 import time
+import mmap
+import atexit
+import asyncio
 import argparse
-from typing import Dict, Any, Iterable, List, Set, Optional
+import threading
+from array import array
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+from urllib.parse import urlencode
+import httpx
+import orjson
 import requests
 from dotenv import load_dotenv
 
@@ -33,8 +56,18 @@ from urllib3.util.retry import Retry
 
 API_BASE = "https://info.gbiz.go.jp/hojin"
 SEARCH = API_BASE + "/v1/hojin"
-DETAIL = API_BASE + "/v1/hojin/{corporate_number}"
+DETAIL_PREFIX = API_BASE + "/v1/hojin/"  # + corporate_number
 TIMEOUT = 60  # タイムアウトを30秒から60秒に延長
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_TOTAL = 5  # 429/5xx・通信エラーの再試行回数（同期/並行で共通）
+BACKOFF_FACTOR = 0.3  # 指数バックオフの基準秒（0.3, 0.6, 1.2, ...）
+BACKOFF_MAX = 8.0  # バックオフ1回あたりの上限秒（Retry-After がある時はそちらに従う）
+APPEND_BATCH = 256  # CSV追記をまとめて書き込む行数（この単位で flush する）
+PROGRESS_WINDOW = 128  # 進捗の速度・ETA を求める直近サンプル数
+
+_ALL_PREFS: Tuple[str, ...] = tuple(f"{i:02d}" for i in range(1, 48))  # JIS X 0401
+
+LIST_FIELDS = ["corporate_number", "name"]
 
 BASIC_FIELDS = [
     "corporate_number",
@@ -54,61 +87,133 @@ BASIC_FIELDS = [
 # -----------------------------
 # HTTP helpers
 # -----------------------------
+@lru_cache(maxsize=None)
 def _hdr(tok: str) -> Dict[str, str]:
-    """gBizINFO APIリクエスト用ヘッダを生成する。"""
+    """gBizINFO APIリクエスト用ヘッダを生成する（トークンごとに同じ dict を使い回す。変更しないこと）。"""
     return {"X-hojinInfo-api-token": tok}
 
 
+_SESSION: Optional[requests.Session] = None
+
+
+def _pooled_adapter() -> HTTPAdapter:
+    """コネクションプールと共通のリトライ方針（429 は Retry-After どおり待つ）を持つ Adapter。"""
+    return HTTPAdapter(
+        pool_connections=64,
+        pool_maxsize=64,
+        max_retries=Retry(
+            total=RETRY_TOTAL,
+            backoff_factor=BACKOFF_FACTOR,
+            backoff_max=BACKOFF_MAX,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=["GET"],
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        ),
+    )
+
+
+def _shared_session() -> requests.Session:
+    """モジュール共有の Session を遅延生成して返す（コネクションプールを使い回す）。"""
+    global _SESSION
+    if _SESSION is None:
+        s = requests.Session()
+        adapter = _pooled_adapter()
+        s.mount("https://", adapter)
+        s.mount("http://", adapter)
+        atexit.register(s.close)
+        _SESSION = s
+    return _SESSION
+
+
 def _get_json(
-    url: str, headers: Dict[str, str], params: Optional[Dict[str, str]] = None
+    url: str,
+    headers: Dict[str, str],
+    params: Optional[Dict[str, str]] = None,
+    session: Optional[requests.Session] = None,
 ) -> Dict[str, Any]:
-    """指定URLへGETし、JSONを辞書で返す（204は空配列ラップで正規化）。リトライ機能付き。"""
-    session = requests.Session()
-    retry = Retry(
-        total=5,
-        backoff_factor=1.0,
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["GET"],
-    )
-    adapter = HTTPAdapter(max_retries=retry)
-    session.mount("https://", adapter)
-    session.mount("http://", adapter)
-    
+    """指定URLへGETし、JSONを辞書で返す（204は空配列ラップで正規化）。リトライ機能付き。
+
+    session 未指定時はモジュール共有の Session を使う（呼び出しごとの接続確立を避ける）。
+    """
+    s = session if session is not None else _shared_session()
     try:
-        r = session.get(url, headers=headers, params=params, timeout=TIMEOUT)
+        r = s.get(url, headers=headers, params=params, timeout=TIMEOUT)
         if r.status_code == 204:
             return {"hojin-infos": []}
         if r.status_code != 200:
             raise RuntimeError(f"HTTP {r.status_code}: {r.text[:300]}")
-        return r.json()
+        return orjson.loads(r.content)
     except requests.exceptions.Timeout:
         raise RuntimeError(f"Request timeout after {TIMEOUT} seconds")
     except requests.exceptions.ConnectionError as e:
         raise RuntimeError(f"Connection error: {str(e)}")
-    finally:
-        session.close()
 
 
 def _make_session(tok: str) -> requests.Session:
     """Keep-Alive とコネクションプールを有効にした Session を返す。"""
     s = requests.Session()
-    s.headers.update({"X-hojinInfo-api-token": tok})
-    adapter = HTTPAdapter(
-        pool_connections=64,
-        pool_maxsize=64,
-        max_retries=Retry(
-            total=3,
-            backoff_factor=0.5,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["GET"],
-            raise_on_status=False,
-        ),
-    )
+    s.headers.update(_hdr(tok))
+    adapter = _pooled_adapter()
     s.mount("https://", adapter)
     s.mount("http://", adapter)
     return s
 
 
+class TokenBucket:
+    """トークンバケット方式のレート制限。
+
+    rate_per_sec の速度でトークンを補充し、最大 burst 個まで貯める。固定スリープと違い、
+    応答が遅かったリクエストの後に余計な待ちを入れない。rate_per_sec <= 0 で無制限。
+    スレッド/コルーチンのどちらから使ってもよい。
+    """
+
+    def __init__(self, rate_per_sec: float, burst: int = 1) -> None:
+        self.rate = rate_per_sec
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._stamp = time.monotonic()
+        self._hold_until = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_sleep(cls, sleep: float, workers: int = 1) -> "TokenBucket":
+        """従来の --sleep（1ワーカーあたりのリクエスト間隔）相当のバケットを作る。"""
+        workers = max(1, workers)
+        return cls(workers / sleep if sleep > 0 else 0.0, burst=workers)
+
+    def _reserve(self) -> float:
+        """トークンを1つ予約し、使えるようになるまでの待ち秒数を返す。"""
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._hold_until - now)
+            if self.rate <= 0:
+                return wait
+            self._tokens = min(
+                float(self.burst), self._tokens + (now - self._stamp) * self.rate
+            )
+            self._stamp = now
+            self._tokens -= 1.0
+            if self._tokens < 0:
+                wait = max(wait, -self._tokens / self.rate)
+            return wait
+
+    def pause(self, seconds: float) -> None:
+        """429 の Retry-After などを受けて、全体の送出を seconds 秒止める。"""
+        with self._lock:
+            self._hold_until = max(self._hold_until, time.monotonic() + seconds)
+
+    def acquire_sync(self) -> None:
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire(self) -> None:
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
 # -----------------------------
 # step1: 法人一覧ダンプ
 # -----------------------------
@@ -118,21 +223,23 @@ def iter_corporate_list(
     corporate_type: str = "301",
     limit: int = 5000, 
     exist_flg: Optional[str] = None,
-    max_pages: int = 10
+    max_pages: int = 10,
+    session: Optional[requests.Session] = None,
 ) -> Iterable[Dict[str, Any]]:
     """指定法人種別の「法人番号・社名」を、指定の都道府県についてページング取得するジェネレータ。"""
     headers = _hdr(tok)
+    params = {
+        "corporate_type": corporate_type,  # 法人種別
+        "prefecture": pref_code,  # JIS X 0401 (2桁)
+        "limit": str(limit),  # <= 5000
+    }
+    if exist_flg in ("true", "false"):
+        params["exist_flg"] = exist_flg
+    # ページ以外のクエリは不変なので、URLは一度だけ組み立てて page 番号だけ付け足す
+    url_prefix = f"{SEARCH}?{urlencode(params)}&page="
+
     for page in range(1, max_pages + 1):
-        params = {
-            "corporate_type": corporate_type,  # 法人種別
-            "prefecture": pref_code,  # JIS X 0401 (2桁)
-            "limit": str(limit),  # <= 5000
-            "page": str(page),
-        }
-        if exist_flg in ("true", "false"):
-            params["exist_flg"] = exist_flg
-
-        js = _get_json(SEARCH, headers, params)
+        js = _get_json(url_prefix + str(page), headers, session=session)
         items = js.get("hojin-infos") or []
         if not items:
             break
@@ -148,10 +255,12 @@ def iter_corporate_list(
 # -----------------------------
 # step2: 法人番号から基本情報を取得
 # -----------------------------
-def fetch_basic(tok: str, corporate_number: str) -> Optional[Dict[str, Any]]:
+def fetch_basic(
+    tok: str, corporate_number: str, session: Optional[requests.Session] = None
+) -> Optional[Dict[str, Any]]:
     """法人番号をキーに、/v1/hojin/{corporate_number} で法人基本情報を1件取得する。"""
-    url = DETAIL.format(corporate_number=corporate_number.strip())
-    js = _get_json(url, _hdr(tok))
+    url = DETAIL_PREFIX + corporate_number.strip()
+    js = _get_json(url, _hdr(tok), session=session)
     arr = js.get("hojin-infos") or []
     return arr[0] if arr else None
 
@@ -160,10 +269,10 @@ def fetch_basic_with_session(
     session: requests.Session, corporate_number: str
 ) -> Optional[Dict[str, Any]]:
     """Session を用いて /v1/hojin/{corporate_number} を取得（コネクション再利用）。"""
-    url = f"{API_BASE}/v1/hojin/{corporate_number.strip()}"
+    url = DETAIL_PREFIX + corporate_number.strip()
     r = session.get(url, timeout=TIMEOUT)
     if r.status_code == 200:
-        js = r.json()
+        js = orjson.loads(r.content)
         arr = js.get("hojin-infos") or []
         return arr[0] if arr else None
     if r.status_code in (204, 404):
@@ -172,43 +281,228 @@ def fetch_basic_with_session(
     raise RuntimeError(f"HTTP {r.status_code}: {r.text[:300]}")
 
 
+async def fetch_basic_async(
+    client: httpx.AsyncClient,
+    corporate_number: str,
+    bucket: Optional[TokenBucket] = None,
+) -> Optional[Dict[str, Any]]:
+    """httpx の AsyncClient で /v1/hojin/{corporate_number} を取得（429/5xx・通信エラーは指数バックオフで再試行）。
+
+    bucket を渡すと各送信前にトークンを取得し、429 の Retry-After 分だけバケット全体を止める。
+    """
+    url = DETAIL_PREFIX + corporate_number.strip()
+    for attempt in range(RETRY_TOTAL + 1):
+        if bucket is not None:
+            await bucket.acquire()
+        delay = min(BACKOFF_MAX, BACKOFF_FACTOR * (2 ** attempt))
+        try:
+            r = await client.get(url)
+        except httpx.TransportError as e:
+            # 接続失敗・タイムアウト・切断は同期側の urllib3 Retry と同様に再試行する
+            if attempt == RETRY_TOTAL:
+                raise RuntimeError(f"{type(e).__name__}: {e}") from e
+            await asyncio.sleep(delay)
+            continue
+        if r.status_code == 200:
+            js = orjson.loads(r.content)
+            arr = js.get("hojin-infos") or []
+            return arr[0] if arr else None
+        if r.status_code in (204, 404):
+            return None
+        if r.status_code not in RETRY_STATUSES or attempt == RETRY_TOTAL:
+            raise RuntimeError(f"HTTP {r.status_code}: {r.text[:300]}")
+        retry_after = r.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            delay = float(retry_after)
+            if bucket is not None:
+                bucket.pause(delay)
+        await asyncio.sleep(delay)
+    return None
+
+
 # -----------------------------
 # CSV helpers
 # -----------------------------
-def read_existing_numbers(path: str) -> Set[str]:
-    """既存CSVから `corporate_number` を読み取り、重複スキップ用セットを作る。"""
-    s: Set[str] = set()
+class CorporateNumberSet:
+    """法人番号の集合。既存分は uint64 のソート済み配列に詰めて保持し、二分探索で引く。
+
+    13桁の法人番号は uint64 に収まるため、1件 8 バイトで済む（str の set より大幅に省メモリ）。
+    実行中に追加された番号は小さな set に別途持つ。照会は str / bytes のどちらでもよい。
+    """
+
+    def __init__(self, numbers: Iterable[int] = ()) -> None:
+        self._packed = array("Q", sorted(numbers))
+        self._added: Set[Any] = set()
+
+    @staticmethod
+    def _key(cno: Union[str, bytes]) -> Any:
+        # '²' 等も isdigit() は True になるため、ASCII 数字に限って int にする
+        return int(cno) if cno.isascii() and cno.isdigit() else cno
+
+    def __contains__(self, cno: Union[str, bytes]) -> bool:
+        k = self._key(cno)
+        if k in self._added:
+            return True
+        if not isinstance(k, int):
+            return False
+        i = bisect_left(self._packed, k)
+        return i < len(self._packed) and self._packed[i] == k
+
+    def add(self, cno: str) -> None:
+        if cno not in self:
+            self._added.add(self._key(cno))
+
+    def __len__(self) -> int:
+        return len(self._packed) + len(self._added)
+
+
+def read_existing_numbers(path: str) -> CorporateNumberSet:
+    """既存CSVから `corporate_number` を読み取り、重複スキップ用の集合を作る。
+
+    本ツールが書くCSVは先頭列が常に `corporate_number` なので、行ごとの dict を作らず
+    csv.reader の先頭列だけを見る（自由記述欄の改行を含むクォートも正しく扱える）。
+    13桁のASCII数字以外は法人番号とみなさない。
+    """
     if not os.path.exists(path):
-        return s
-    with open(path, newline="", encoding="utf-8") as f:
-        r = csv.DictReader(f)
-        for row in r:
-            c = (row.get("corporate_number") or "").strip()
-            if c:
-                s.add(c)
-    return s
+        return CorporateNumberSet()
+    with open(path, newline="", encoding="utf-8", buffering=1 << 20) as f:
+        r = csv.reader(f)
+        next(r, None)  # ヘッダ
+        return CorporateNumberSet(
+            int(c)
+            for c in (row[0].strip() for row in r if row)
+            if len(c) == 13 and c.isascii() and c.isdigit()
+        )
 
 
 def append_rows(path: str, rows: List[Dict[str, Any]], header: List[str]) -> None:
-    """CSVに行を追記する（存在しないファイルにはヘッダも書く）。"""
-    newfile = not os.path.exists(path)
-    with open(path, "a", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=header)
-        if newfile:
-            w.writeheader()
+    """CSVに行を追記する（空/存在しないファイルにはヘッダも書く）。単発の追記用。"""
+    with CsvAppender(path, header, batch=len(rows) or 1) as w:
         for row in rows:
-            w.writerow({k: row.get(k, "") for k in header})
+            w.write(row)
+
+
+def _iter_input_numbers(
+    path: str, skip: Optional[CorporateNumberSet] = None
+) -> Iterator[str]:
+    """hydrate 入力CSVから `corporate_number` 列の値を順に返す（空値と skip に含まれる番号は飛ばす）。
+
+    `corporate_number` が先頭列で、かつファイルにクォートが無い（= 複数行にまたがる
+    レコードが無い）とき（通常の dump 出力）は、mmap した領域を改行・カンマ位置で
+    切り出すだけで走査し、skip 判定も bytes のまま行う。デコードは返す番号だけに限る。
+    それ以外は csv.reader + 列インデックスで読む。どちらも13桁のASCII数字だけを返す。
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm)
+            end = mm.find(b"\n")
+            if end < 0:
+                end = size
+            header = next(csv.reader([mm[:end].decode("utf-8").rstrip("\r")]), [])
+            if "corporate_number" not in header:
+                return
+            if header.index("corporate_number") == 0 and mm.find(b'"', end) < 0:
+                pos = end + 1
+                while pos < size:
+                    nl = mm.find(b"\n", pos)
+                    if nl < 0:
+                        nl = size
+                    comma = mm.find(b",", pos, nl)
+                    field = mm[pos : comma if comma >= 0 else nl]
+                    pos = nl + 1
+                    # 本ツールが書いた値は13桁の数字そのままなので、崩れている時だけ整形する
+                    if len(field) != 13 or not field.isdigit():
+                        field = field.strip()
+                        if len(field) != 13 or not field.isdigit():
+                            continue
+                    if skip is not None and field in skip:
+                        continue
+                    yield field.decode("ascii")
+                return
+    yield from _iter_csv_column(path, header.index("corporate_number"), skip)
+
+
+def _iter_csv_column(
+    path: str, idx: int, skip: Optional[CorporateNumberSet] = None
+) -> Iterator[str]:
+    """csv.reader で idx 列目の法人番号を順に返す（_iter_input_numbers のフォールバック）。"""
+    with open(path, newline="", encoding="utf-8", buffering=1 << 20) as f:
+        r = csv.reader(f)
+        next(r, None)  # ヘッダ
+        for row in r:
+            if len(row) <= idx:
+                continue
+            cno = row[idx]
+            if len(cno) != 13 or not (cno.isascii() and cno.isdigit()):
+                cno = cno.strip()
+                if len(cno) != 13 or not (cno.isascii() and cno.isdigit()):
+                    continue
+            if skip is not None and cno in skip:
+                continue
+            yield cno
+
+
+class CsvAppender:
+    """CSVへの追記ライタ。ファイルは1度だけ開き、行をバッファして batch 行ごとに書き出す。
+
+    flush 済みの行までがディスク上に残るため、中断時も --resume で続きから再開できる。
+    """
+
+    def __init__(self, path: str, header: List[str], batch: int = APPEND_BATCH) -> None:
+        self._f = open(path, "a", newline="", encoding="utf-8", buffering=1 << 20)
+        self._w = csv.DictWriter(
+            self._f, fieldnames=header, restval="", extrasaction="ignore"
+        )
+        # 追記モードの位置は末尾なので、0 なら新規/空ファイル（stat 不要）
+        if self._f.tell() == 0:
+            self._w.writeheader()
+        self._buf: List[Dict[str, Any]] = []
+        self._batch = max(1, batch)
+
+    def write(self, row: Dict[str, Any]) -> None:
+        """1行をバッファに積み、batch 行たまったら書き出す。"""
+        self._buf.append(row)
+        if len(self._buf) >= self._batch:
+            self.flush()
+
+    def flush(self) -> None:
+        """バッファ済みの行を書き出し、ファイルを flush する。"""
+        if self._buf:
+            self._w.writerows(self._buf)
+            self._buf.clear()
+        self._f.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self._f.close()
+
+    def __enter__(self) -> "CsvAppender":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
 
 
 # -----------------------------
 # Progress helpers（hydrate用）
 # -----------------------------
 def _count_csv_rows(path: str) -> int:
-    """CSVのデータ行数（ヘッダ除く）を数える。"""
+    """CSVのデータ行数（ヘッダ除く）を数える。
+
+    進捗の分母に使うだけなので、デコードせずバイナリのまま 1MiB ずつ改行を数える。
+    """
     if not os.path.exists(path):
         return 0
-    with open(path, "r", encoding="utf-8") as f:
-        total = sum(1 for _ in f)
+    total = 0
+    last = b"\n"
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            total += chunk.count(b"\n")
+            last = chunk[-1:]
+    if last != b"\n":
+        total += 1  # 末尾に改行のない最終行
     return max(0, total - 1)
 
 
@@ -220,21 +514,183 @@ def _fmt_hms(seconds: float) -> str:
     return f"{h:d}:{m:02d}:{s:02d}"
 
 
+class _ProgressLine:
+    """進捗を stderr に出す。端末なら同じ行を \\r で上書きし、そうでなければ1行ずつ出す。
+
+    stderr はバッファされない（write_through）ため、進捗テキストは手元に貯めておき、
+    最短 min_flush 秒間隔でまとめて1回だけ書き出す。端末では最新の1行だけを残す。
+    """
+
+    def __init__(self, min_flush: float = 1.0) -> None:
+        self.min_flush = min_flush
+        self._last_flush = 0.0
+        self._width = 0
+        self._open = False
+        self._tty: Optional[bool] = None
+        self._pending: List[str] = []
+
+    def update(self, msg: str, final: bool = False) -> None:
+        if self._tty is None:
+            self._tty = sys.stderr.isatty()
+        if self._tty:
+            self._width = max(self._width, len(msg))
+            # 上書き表示なので、まだ書き出していない古い進捗は捨ててよい
+            self._pending = ["\r" + msg.ljust(self._width)]
+            self._open = True
+        else:
+            self._pending.append(msg + "\n")
+        now = time.monotonic()
+        if final or now - self._last_flush >= self.min_flush:
+            self._drain(now)
+        if final:
+            self._close_line()
+
+    def message(self, msg: str) -> None:
+        """貯めた進捗を書き出して行を確定させてから、通常のメッセージを1行出す。"""
+        self.flush()
+        print(msg, file=sys.stderr, flush=True)
+
+    def flush(self) -> None:
+        """貯めた進捗を書き出して行を確定させる（中断時に最後の進捗を失わないよう終了時にも呼ぶ）。"""
+        self._drain(time.monotonic())
+        self._close_line()
+
+    def _drain(self, now: float) -> None:
+        if self._pending:
+            sys.stderr.write("".join(self._pending))
+            sys.stderr.flush()
+            self._pending.clear()
+        self._last_flush = now
+
+    def _close_line(self) -> None:
+        if self._open:
+            sys.stderr.write("\n")
+            sys.stderr.flush()
+            self._open = False
+            self._width = 0
+
+
+_PROGRESS = _ProgressLine()
+atexit.register(_PROGRESS.flush)
+
+
 def _print_hydrate_progress(
-    done: int, total: int, added: int, errors: int, t0: float
+    done: int,
+    total: int,
+    added: int,
+    errors: int,
+    t0: float,
+    final: bool = False,
+    samples: Optional[Deque[Tuple[float, int]]] = None,
 ) -> None:
-    """hydrate処理の進捗を1行で表示する（ETA/処理レート付き）。"""
-    elapsed = max(1e-6, time.monotonic() - t0)
+    """hydrate処理の進捗を1行で表示する（ETA/処理レート付き）。final=True で行を確定する。
+
+    samples（maxlen 付き deque）を渡すと直近の (時刻, 件数) から速度を求めるため、
+    立ち上がりの遅さや途中の失速が ETA に素早く反映される。序盤（10%未満）の ETA は "?"。
+    """
+    now = time.monotonic()
+    elapsed = max(1e-6, now - t0)
     rate = done / elapsed
+    if samples is not None:
+        samples.append((now, done))
+        t_old, done_old = samples[0]
+        if now - t_old > 1e-6:
+            rate = (done - done_old) / (now - t_old)
     pct = (done / total * 100) if total else 100.0
     remain = max(0, total - done)
-    eta = remain / rate if rate > 0 else 0.0
+    if total and done < 0.1 * total and not final:
+        eta_s = "?"
+    else:
+        eta_s = _fmt_hms(remain / rate if rate > 0 else 0.0)
     msg = (
         f"[hydrate] {done}/{total} ({pct:5.1f}%) "
         f"added={added} err={errors} "
-        f"rate={rate:5.1f}/s ETA={_fmt_hms(eta)} elapsed={_fmt_hms(elapsed)}"
+        f"rate={rate:5.1f}/s ETA={eta_s} elapsed={_fmt_hms(elapsed)}"
     )
-    print(msg, file=sys.stderr, flush=True)
+    _PROGRESS.update(msg, final=final)
+
+
+# -----------------------------
+# Dump runner（単体/パイプライン両対応）
+# -----------------------------
+def _run_dump(
+    tok: str,
+    dest: str,
+    targets: Iterable[str],
+    corporate_type: str,
+    limit: int,
+    max_pages: int,
+    exist_flg: Optional[str],
+    sleep: float,
+    resume: bool,
+    workers: int,
+) -> Tuple[array, List[str]]:
+    """都道府県ごとに法人一覧を取得してCSVに追記する共通関数。
+
+    (今回追記した法人番号を追記順に詰めた uint64 配列, 取得に失敗した都道府県) を返す。
+
+    取得は workers 本のスレッドで都道府県単位に並行し（Session は共有）、
+    重複判定と書き込みは呼び出し元スレッドだけが行う。ある都道府県の失敗はログに残して
+    他の都道府県の書き込みを続け、中断（Ctrl-C 等）時は未着手の取得を取り消す。
+    """
+    seen = read_existing_numbers(dest) if resume else CorporateNumberSet()
+    session = _shared_session()
+    bucket = TokenBucket.from_sleep(sleep)
+
+    def fetch(pref: str) -> List[Dict[str, Any]]:
+        bucket.acquire_sync()
+        return list(
+            iter_corporate_list(
+                tok,
+                pref,
+                corporate_type=corporate_type,
+                limit=min(max(1, limit), 5000),
+                exist_flg=exist_flg,
+                max_pages=min(max(1, max_pages), 10),
+                session=session,
+            )
+        )
+
+    appended = array("Q")
+    failed: List[str] = []
+    with CsvAppender(dest, LIST_FIELDS) as writer, ThreadPoolExecutor(
+        max_workers=max(1, workers)
+    ) as ex:
+        futures = {ex.submit(fetch, pref): pref for pref in targets}
+        try:
+            for fut in as_completed(futures):
+                # 書き込み済みの都道府県の結果を抱え込まないよう、Future の参照を手放していく
+                pref = futures.pop(fut)
+                try:
+                    rows = fut.result()
+                except Exception as e:
+                    failed.append(pref)
+                    print(f"[dump] pref={pref} error: {e}", file=sys.stderr)
+                    continue
+                finally:
+                    del fut
+                got = 0
+                for row in rows:
+                    cno = (row.get("corporate_number") or "").strip()
+                    if not cno or cno in seen:  # スキップ/重複
+                        continue
+                    writer.write(row)
+                    seen.add(cno)
+                    if cno.isascii() and cno.isdigit():
+                        appended.append(int(cno))
+                    got += 1
+                del rows
+                writer.flush()
+                print(
+                    f"[dump] pref={pref} added={got} total={len(appended)}",
+                    file=sys.stderr,
+                )
+        except BaseException:
+            ex.shutdown(wait=False, cancel_futures=True)
+            raise
+    if failed:
+        print(f"[dump] failed prefs={','.join(sorted(failed))}", file=sys.stderr)
+    return appended, failed
 
 
 # -----------------------------
@@ -248,23 +704,50 @@ def _run_hydrate(
     resume: bool,
     progress_every: int,
     progress_interval: float,
+    concurrency: int = 1,
+    candidates: Optional[array] = None,
 ) -> int:
-    """法人番号リストから基本情報を取得してCSVに追記する共通関数（進捗表示つき）。"""
-    processed = read_existing_numbers(out) if resume else set()
-    if not os.path.exists(infile):
+    """法人番号リストから基本情報を取得してCSVに追記する共通関数（進捗表示つき）。
+
+    concurrency > 1 のときは asyncio + httpx（HTTP/2）による並行取得（_run_hydrate_async）を使う。
+    candidates（法人番号を詰めた uint64 配列）を渡すと infile を読まず、その順に処理する（pipeline 用）。
+    """
+    processed = read_existing_numbers(out) if resume else CorporateNumberSet()
+    if candidates is not None:
+        numbers: Iterable[str] = (f"{n:013d}" for n in candidates)
+        total_rows = len(candidates)
+        source = "dump"
+    elif not os.path.exists(infile):
         print(f"ERROR: not found: {infile}", file=sys.stderr)
         return 0
-
-    total_rows = _count_csv_rows(infile)
+    else:
+        numbers = _iter_input_numbers(infile, skip=processed)
+        total_rows = _count_csv_rows(infile)
+        source = f"infile={infile}"
     approx_already = len(processed)
     approx_target = max(0, total_rows - approx_already)
     print(
-        f"[hydrate] start infile={infile} total_rows={total_rows} "
+        f"[hydrate] start {source} total_rows={total_rows} "
         f"resume={resume} approx_target={approx_target}",
         file=sys.stderr,
         flush=True,
     )
 
+    if concurrency > 1:
+        return asyncio.run(
+            _run_hydrate_async(
+                tok=tok,
+                numbers=numbers,
+                out=out,
+                sleep=sleep,
+                processed=processed,
+                total=approx_target or total_rows,
+                concurrency=concurrency,
+                progress_every=progress_every,
+                progress_interval=progress_interval,
+            )
+        )
+
     added = 0
     errors = 0
     done = 0
@@ -272,27 +755,24 @@ def _run_hydrate(
     last_print = t0
     show_every = max(0, int(progress_every))
     show_interval = max(0.0, float(progress_interval))
+    samples: Deque[Tuple[float, int]] = deque(maxlen=PROGRESS_WINDOW)
 
-    with _make_session(tok) as session, open(infile, newline="", encoding="utf-8") as f:
-        r = csv.DictReader(f)
-        for row in r:
-            cno = (row.get("corporate_number") or "").strip()
-            if not cno or cno in processed:
+    bucket = TokenBucket.from_sleep(sleep)
+    with _make_session(tok) as session, CsvAppender(out, BASIC_FIELDS) as writer:
+        for cno in numbers:
+            if cno in processed:
                 continue
 
             d = None
+            bucket.acquire_sync()
             try:
                 d = fetch_basic_with_session(session, cno)
             except Exception as e:
                 errors += 1
-                print(
-                    f"[hydrate] corporate_number={cno} error: {e}",
-                    file=sys.stderr,
-                    flush=True,
-                )
+                _PROGRESS.message(f"[hydrate] corporate_number={cno} error: {e}")
 
             if d is not None:
-                append_rows(out, [d], header=BASIC_FIELDS)
+                writer.write(d)
                 processed.add(cno)
                 added += 1
 
@@ -309,18 +789,128 @@ def _run_hydrate(
                     added=added,
                     errors=errors,
                     t0=t0,
+                    samples=samples,
                 )
                 last_print = now
 
-            if sleep:
-                time.sleep(sleep)
-
     _print_hydrate_progress(
         done=done,
         total=approx_target or total_rows,
         added=added,
         errors=errors,
         t0=t0,
+        final=True,
+        samples=samples,
+    )
+    print(f"OK: {added}件 追記しました -> {out}", file=sys.stderr, flush=True)
+    return added
+
+
+async def _run_hydrate_async(
+    tok: str,
+    numbers: Iterable[str],
+    out: str,
+    sleep: float,
+    processed: CorporateNumberSet,
+    total: int,
+    concurrency: int,
+    progress_every: int,
+    progress_interval: float,
+) -> int:
+    """_run_hydrate の並行版。N 個のワーカーで取得し、単一のライタが CSV に追記する。"""
+    todo: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 4)
+    results: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 4)
+
+    added = 0
+    errors = 0
+    done = 0
+    t0 = time.monotonic()
+    last_print = t0
+    show_every = max(0, int(progress_every))
+    show_interval = max(0.0, float(progress_interval))
+    samples: Deque[Tuple[float, int]] = deque(maxlen=PROGRESS_WINDOW)
+    bucket = TokenBucket.from_sleep(sleep, workers=concurrency)
+
+    async def produce() -> None:
+        for cno in numbers:
+            if cno in processed:
+                continue
+            await todo.put(cno)
+        for _ in range(concurrency):
+            await todo.put(None)  # ワーカー終了の合図
+
+    async def work(client: httpx.AsyncClient) -> None:
+        while True:
+            cno = await todo.get()
+            if cno is None:
+                await results.put(None)
+                return
+            d = None
+            err: Optional[Exception] = None
+            try:
+                d = await fetch_basic_async(client, cno, bucket)
+            except Exception as e:
+                err = e
+            await results.put((cno, d, err))
+
+    async def write(writer: CsvAppender) -> None:
+        # 書き込みはこのコルーチンだけが行う（CSV行の混線を防ぐ）
+        nonlocal added, errors, done, last_print
+        finished = 0
+        while finished < concurrency:
+            item = await results.get()
+            if item is None:
+                finished += 1
+                continue
+            cno, d, err = item
+            if err is not None:
+                errors += 1
+                _PROGRESS.message(f"[hydrate] corporate_number={cno} error: {err}")
+            if d is not None:
+                writer.write(d)
+                processed.add(cno)
+                added += 1
+
+            done += 1
+
+            now = time.monotonic()
+            need_by_count = show_every and (done % show_every == 0)
+            need_by_time = show_interval > 0 and (now - last_print) >= show_interval
+            if done == 1 or need_by_count or need_by_time:
+                _print_hydrate_progress(
+                    done=done,
+                    total=total,
+                    added=added,
+                    errors=errors,
+                    t0=t0,
+                    samples=samples,
+                )
+                last_print = now
+
+    # HTTP/2 では1本の接続に複数ストリームを多重化する。HTTP/1.1 にフォールバックした
+    # 場合でも concurrency 本までは接続を張れるよう上限はそろえておく。
+    limits = httpx.Limits(
+        max_connections=concurrency, max_keepalive_connections=concurrency
+    )
+    async with httpx.AsyncClient(
+        http2=True,
+        limits=limits,
+        headers=_hdr(tok),
+        timeout=TIMEOUT,
+    ) as client:
+        with CsvAppender(out, BASIC_FIELDS) as writer:
+            await asyncio.gather(
+                produce(), write(writer), *(work(client) for _ in range(concurrency))
+            )
+
+    _print_hydrate_progress(
+        done=done,
+        total=total,
+        added=added,
+        errors=errors,
+        t0=t0,
+        final=True,
+        samples=samples,
     )
     print(f"OK: {added}件 追記しました -> {out}", file=sys.stderr, flush=True)
     return added
@@ -349,7 +939,7 @@ def main() -> int:
     ap_dump.add_argument(
         "--limit", type=int, default=5000, help="1ページ件数（1〜5000）"
     )
-    ap_dump.add_argument("--sleep", type=float, default=0.2, help="ページ間スリープ秒")
+    ap_dump.add_argument("--sleep", type=float, default=0.2, help="都道府県ごとの取得間隔の下限秒")
     ap_dump.add_argument(
         "--resume", action="store_true", help="既存CSVを読み、重複をスキップ"
     )
@@ -368,6 +958,9 @@ def main() -> int:
     ap_dump.add_argument(
         "--max-pages", type=int, default=10, help="最大ページ数（1〜10）"
     )
+    ap_dump.add_argument(
+        "--workers", type=int, default=8, help="都道府県を並行取得するスレッド数"
+    )
 
     # hydrate サブコマンド
     ap_h = sub.add_parser("hydrate", help="法人番号リストから基本情報を付与")
@@ -380,7 +973,7 @@ def main() -> int:
     ap_h.add_argument(
         "--out", default="gbiz_enriched.csv", help="出力CSVパス（基本情報）"
     )
-    ap_h.add_argument("--sleep", type=float, default=0.2, help="リクエスト間スリープ秒")
+    ap_h.add_argument("--sleep", type=float, default=0.2, help="リクエスト間隔の下限秒（並行時はワーカーあたり）")
     ap_h.add_argument(
         "--resume",
         action="store_true",
@@ -398,6 +991,12 @@ def main() -> int:
         default=0.0,
         help="何秒ごとに進捗を表示するか（0で無効）。件数間隔と併用可。",
     )
+    ap_h.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="同時リクエスト数（1で逐次処理、2以上で asyncio による並行取得）",
+    )
 
     # 1-shot パイプライン
     ap_p = sub.add_parser("pipeline", help="dump -> hydrate を連続実行")
@@ -407,7 +1006,7 @@ def main() -> int:
         "--enrich-out", default="gbiz_enriched.csv", help="hydrateの出力CSV"
     )
     ap_p.add_argument(
-        "--sleep", type=float, default=0.2, help="各リクエスト間のスリープ秒"
+        "--sleep", type=float, default=0.2, help="各リクエスト間隔の下限秒"
     )
     ap_p.add_argument(
         "--exist-flg",
@@ -427,6 +1026,9 @@ def main() -> int:
     ap_p.add_argument(
         "--max-pages", type=int, default=10, help="最大ページ数（1〜10）"
     )
+    ap_p.add_argument(
+        "--workers", type=int, default=8, help="dump で都道府県を並行取得するスレッド数"
+    )
     ap_p.add_argument(
         "--progress-every",
         type=int,
@@ -439,6 +1041,12 @@ def main() -> int:
         default=0.0,
         help="hydrate の進捗: 何秒ごとに表示（0で無効）",
     )
+    ap_p.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="hydrate の同時リクエスト数（1で逐次処理）",
+    )
     ap_p.add_argument(
         "--resume",
         action="store_true",
@@ -456,34 +1064,21 @@ def main() -> int:
     # ---- dump ----
     if args.cmd == "dump":
         dest = args.out
-        seen = read_existing_numbers(dest) if args.resume else set()
-        targets = (
-            [f"{i:02d}" for i in range(1, 48)] if args.pref == "all" else [args.pref]
+        targets = _ALL_PREFS if args.pref == "all" else (args.pref,)
+        appended, failed = _run_dump(
+            tok=tok,
+            dest=dest,
+            targets=targets,
+            corporate_type=args.corporate_type,
+            limit=args.limit,
+            max_pages=args.max_pages,
+            exist_flg=None if args.exist_flg == "any" else args.exist_flg,
+            sleep=args.sleep,
+            resume=args.resume,
+            workers=args.workers,
         )
-        total_new = 0
-        exist_flag_param = None if args.exist_flg == "any" else args.exist_flg
-        for pref in targets:
-            got = 0
-            for row in iter_corporate_list(
-                tok,
-                pref,
-                corporate_type=args.corporate_type,
-                limit=min(max(1, args.limit), 5000),
-                exist_flg=exist_flag_param,
-                max_pages=min(max(1, args.max_pages), 10),
-            ):
-                cno = (row.get("corporate_number") or "").strip()
-                if not cno or cno in seen:  # スキップ/重複
-                    continue
-                append_rows(dest, [row], header=["corporate_number", "name"])
-                seen.add(cno)
-                got += 1
-                total_new += 1
-            print(f"[dump] pref={pref} added={got} total={total_new}", file=sys.stderr)
-            if args.sleep:
-                time.sleep(args.sleep)
-        print(f"OK: {total_new}件 追記しました -> {dest}")
-        return 0
+        print(f"OK: {len(appended)}件 追記しました -> {dest}")
+        return 1 if failed else 0
 
     # ---- hydrate ----
     if args.cmd == "hydrate":
@@ -495,6 +1090,7 @@ def main() -> int:
             resume=args.resume,
             progress_every=args.progress_every,  # ← タイポ修正
             progress_interval=args.progress_interval,
+            concurrency=args.concurrency,
         )
         return 0 if added >= 0 else 1
 
@@ -502,38 +1098,36 @@ def main() -> int:
     if args.cmd == "pipeline":
         # dump
         print("[pipeline] dump...", file=sys.stderr)
-        targets = (
-            [f"{i:02d}" for i in range(1, 48)] if args.pref == "all" else [args.pref]
+        targets = _ALL_PREFS if args.pref == "all" else (args.pref,)
+        appended, failed = _run_dump(
+            tok=tok,
+            dest=args.list_out,
+            targets=targets,
+            corporate_type=args.corporate_type,
+            limit=args.limit,
+            max_pages=args.max_pages,
+            exist_flg=None if args.exist_flg == "any" else args.exist_flg,
+            sleep=args.sleep,
+            resume=args.resume,
+            workers=args.workers,
         )
-        exist_flag_param = None if args.exist_flg == "any" else args.exist_flg
-        for pref in targets:
-            got = 0
-            seen = read_existing_numbers(args.list_out) if args.resume else set()
-            for row in iter_corporate_list(
-                tok, pref, corporate_type=args.corporate_type, limit=args.limit, exist_flg=exist_flag_param, max_pages=args.max_pages
-            ):
-                cno = (row.get("corporate_number") or "").strip()
-                if not cno or cno in seen:
-                    continue
-                append_rows(args.list_out, [row], header=["corporate_number", "name"])
-                seen.add(cno)
-                got += 1
-            print(f"[dump] pref={pref} added={got}", file=sys.stderr)
-            if args.sleep:
-                time.sleep(args.sleep)
 
         # hydrate（進捗表示つき）
         print("[pipeline] hydrate...", file=sys.stderr)
         _run_hydrate(
             tok=tok,
             infile=args.list_out,
+            # resume 時は前回 hydrate し損ねた既存行も対象にするため、リストCSVを読む
+            candidates=None if args.resume else appended,
             out=args.enrich_out,
             sleep=args.sleep,
             resume=args.resume,
             progress_every=args.progress_every,
             progress_interval=args.progress_interval,
+            concurrency=args.concurrency,
         )
-        return 0
+        # 取りこぼした都道府県があれば、hydrate 後に dump 単体と同じく失敗として返す
+        return 1 if failed else 0
 
     # ヘルプ表示
     ap.print_help()